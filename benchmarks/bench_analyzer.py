@@ -0,0 +1,146 @@
+"""
+Measures FinancialAnalyzer / Categorizer construction time and peak memory on synthetic data,
+against a baseline that reproduces the previous copy-based construction.
+
+Usage:
+    python benchmarks/bench_analyzer.py --rows 5000000
+    python benchmarks/bench_analyzer.py --rows 5000000 --skip-baseline
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../src"))
+
+from analytics import FinancialAnalyzer
+from categorizer import Categorizer
+
+CATEGORIES = ['Rent', 'Travel', 'Utilities', 'Health & Fitness', 'Shopping',
+              'Food & Drink', 'Salary', 'Entertainment', 'Investment', 'Other']
+
+
+def make_data(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    category = np.array(CATEGORIES, dtype=object)[rng.integers(0, len(CATEGORIES), n_rows)]
+    # A few rows without a category, as in real exports
+    category[rng.random(n_rows) < 0.001] = np.nan
+    return pd.DataFrame({
+        'date': pd.Timestamp('2015-01-01') + pd.to_timedelta(rng.integers(0, 3650, n_rows), unit='D'),
+        'transaction_description': pd.Series(rng.integers(0, 5000, n_rows)).map(lambda i: f"Merchant {i}"),
+        'category': category,
+        'amount': rng.gamma(2.0, 150.0, n_rows).round(2),
+        'type': np.where(rng.random(n_rows) < 0.2, 'Income', 'Expense').astype(object),
+    })
+
+
+class BaselineAnalyzer:
+    """
+    The previous FinancialAnalyzer construction: per-row string normalization and
+    full .copy() of the income and expense frames.
+    """
+
+    def __init__(self, df):
+        self.df = df.copy()  # the old code mutated its input; copy so later runs see the same data
+        self.df.loc[self.df['category'].str.title() == 'Other', 'type'] = 'Income'
+        self.income_df = self.df[self.df['type'].str.lower() == 'income'].copy()
+        self.expense_df = self.df[self.df['type'].str.lower() == 'expense'].copy()
+
+    def get_basic_totals(self):
+        return {
+            "Total Income": self.income_df['amount'].sum(),
+            "Total Expenses": self.expense_df['amount'].sum(),
+            "Net Savings": self.income_df['amount'].sum() - self.expense_df['amount'].sum()
+        }
+
+    def get_category_totals(self):
+        return self.expense_df.groupby('category')['amount'].sum().to_dict()
+
+    def get_monthly_trends(self):
+        trends = pd.DataFrame({
+            'Income': self.income_df.set_index('date').resample('ME')['amount'].sum(),
+            'Expense': self.expense_df.set_index('date').resample('ME')['amount'].sum()
+        }).fillna(0)
+        trends['Savings'] = trends['Income'] - trends['Expense']
+        return trends
+
+
+class BaselineCategorizer:
+    def __init__(self, df):
+        self.df = df
+
+    def get_summary(self):
+        income_df = self.df[self.df['type'].str.title() == 'Income'].copy()
+        expense_df = self.df[self.df['type'].str.title() == 'Expense'].copy()
+        return {
+            "Income Breakdown": income_df.groupby('category')['amount'].sum().to_dict(),
+            "Expense Breakdown": expense_df.groupby('category')['amount'].sum().to_dict()
+        }
+
+
+def measure(label, func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<32} {elapsed:>8.2f} s   peak {peak / 2**20:>9.1f} MiB")
+    return result
+
+
+def check_same(label, expected, actual):
+    if isinstance(expected, pd.DataFrame):
+        pd.testing.assert_frame_equal(expected, actual, check_freq=False, check_names=False, check_index_type=False)
+    elif isinstance(expected, dict):
+        assert expected.keys() == actual.keys(), f"{label}: keys differ"
+        for key in expected:
+            check_same(f"{label}[{key}]", expected[key], actual[key])
+    else:
+        assert np.isclose(expected, actual), f"{label}: {expected} != {actual}"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=5_000_000)
+    parser.add_argument('--skip-baseline', action='store_true', help="only time the current implementation")
+    args = parser.parse_args()
+
+    print(f"Generating {args.rows:,} rows...")
+    df = make_data(args.rows)
+    print(f"Input frame: {df.memory_usage(deep=True).sum() / 2**20:,.1f} MiB\n")
+
+    if not args.skip_baseline:
+        print("Baseline")
+        baseline = measure("  FinancialAnalyzer(df)", lambda: BaselineAnalyzer(df))
+        expected_totals = measure("  get_basic_totals", baseline.get_basic_totals)
+        expected_categories = measure("  get_category_totals", baseline.get_category_totals)
+        expected_trends = measure("  get_monthly_trends", baseline.get_monthly_trends)
+        baseline_categorizer = measure("  Categorizer(df)", lambda: BaselineCategorizer(df))
+        expected_summary = measure("  Categorizer.get_summary", baseline_categorizer.get_summary)
+        print()
+
+    print("Current")
+    analyzer = measure("  FinancialAnalyzer(df)", lambda: FinancialAnalyzer(df))
+    totals = measure("  get_basic_totals", analyzer.get_basic_totals)
+    categories = measure("  get_category_totals", analyzer.get_category_totals)
+    trends = measure("  get_monthly_trends", analyzer.get_monthly_trends)
+    measure("  check_overspending", analyzer.check_overspending)
+    categorizer = measure("  Categorizer(df)", lambda: Categorizer(df))
+    summary = measure("  Categorizer.get_summary", categorizer.get_summary)
+
+    if not args.skip_baseline:
+        check_same("get_basic_totals", expected_totals, totals)
+        check_same("get_category_totals", expected_categories, categories)
+        check_same("get_monthly_trends", expected_trends, trends)
+        for key in expected_summary:
+            check_same(f"get_summary[{key}]", expected_summary[key], summary[key])
+        print("\nResults match the baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compares Excel ingestion paths on the bundled workbook scaled up:
+  - baseline: pd.read_excel with the default engine, all columns
+  - fast:     DataLoader.load_file (calamine engine if installed, only the analysis columns)
+  - parallel: DataLoader.load_files over several workbooks vs loading them one by one
+
+Usage:
+    python benchmarks/bench_excel.py --scale 20 --workbooks 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../src"))
+
+from loader import ANALYSIS_COLUMNS, FAST_EXCEL_AVAILABLE, DataLoader
+
+DATASET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../Datasets/Personal_Finance_Dataset.xlsx")
+
+
+def timed(label, func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<44} {best:>8.3f} s")
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scale', type=int, default=20, help="copies of the bundled workbook's rows")
+    parser.add_argument('--workbooks', type=int, default=4, help="workbooks for the parallel test")
+    args = parser.parse_args()
+
+    base = pd.read_excel(DATASET)
+    scaled = pd.concat([base] * args.scale, ignore_index=True)
+    # A few unused columns, as real bank exports have
+    for extra in ['Account Number', 'Reference', 'Balance', 'Notes']:
+        scaled[extra] = range(len(scaled))
+
+    print(f"fast engine (python-calamine) installed: {FAST_EXCEL_AVAILABLE}")
+    print(f"workbook: {len(scaled):,} rows x {scaled.shape[1]} columns\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.workbooks):
+            path = os.path.join(tmp, f"statement_{i}.xlsx")
+            scaled.to_excel(path, index=False)
+            paths.append(path)
+
+        baseline, _ = timed("pd.read_excel (default engine, all cols)", lambda: pd.read_excel(paths[0]))
+        fast_loader = DataLoader(columns=ANALYSIS_COLUMNS)
+        fast, _ = timed("DataLoader.load_file (fast path)", lambda: fast_loader.load_file(paths[0]))
+        print(f"{'speedup':<44} {baseline / fast:>8.1f} x\n")
+
+        sequential, _ = timed(f"{args.workbooks} workbooks, sequential",
+                              lambda: fast_loader.load_files(paths, max_workers=1), repeat=1)
+        parallel, _ = timed(f"{args.workbooks} workbooks, parallel (load_files)",
+                            lambda: fast_loader.load_files(paths), repeat=1)
+        print(f"{'speedup':<44} {sequential / parallel:>8.1f} x  (on {os.cpu_count()} CPUs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Load test for the HTTP service (src/service.py). Reports p50/p99 latency, requests/sec and
+failed requests per endpoint, with a mix of slow uploads and fast report lookups running concurrently.
+
+Usage:
+    python src/service.py --port 8000 &
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --requests 500 --concurrency 16
+"""
+import argparse
+import json
+import os
+import random
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+SAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../Datasets/Personal_Finance_Data_2.csv")
+
+
+def request(url, data=None, content_type="application/octet-stream"):
+    req = urllib.request.Request(url, data=data, method="POST" if data is not None else "GET")
+    if data is not None:
+        req.add_header("Content-Type", content_type)
+    with urllib.request.urlopen(req, timeout=120) as response:
+        return json.loads(response.read())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url', default="http://127.0.0.1:8000")
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--upload-ratio', type=float, default=0.1, help="share of requests that are uploads")
+    parser.add_argument('--retrieve-ratio', type=float, default=0.0, help="share of /retrieve requests (needs the RAG deps)")
+    args = parser.parse_args()
+
+    with open(SAMPLE, "rb") as f:
+        sample = f.read()
+    dataset_id = request(f"{args.url}/analyze?filename=sample.csv", sample)["dataset_id"]
+
+    def one_call(_):
+        roll = random.random()
+        if roll < args.upload_ratio:
+            name, call = "POST /analyze", lambda: request(f"{args.url}/analyze?filename=sample.csv", sample)
+        elif roll < args.upload_ratio + args.retrieve_ratio:
+            body = json.dumps({"query": "how to reduce overspending", "k": 5}).encode()
+            name, call = "POST /retrieve", lambda: request(f"{args.url}/retrieve", body, "application/json")
+        elif roll < (1 + args.upload_ratio + args.retrieve_ratio) / 2:
+            name, call = "GET /report", lambda: request(f"{args.url}/report/{dataset_id}")
+        else:
+            name, call = "GET /recurrent", lambda: request(f"{args.url}/recurrent/{dataset_id}")
+        start = time.perf_counter()
+        try:
+            call()
+        except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+            # HTTPError (4xx/5xx) is a URLError; record it instead of aborting the run
+            return name, None, getattr(e, 'code', None) or type(e).__name__
+        return name, time.perf_counter() - start, None
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(one_call, range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = defaultdict(list)
+    errors = defaultdict(lambda: defaultdict(int))
+    for name, latency, error in results:
+        for key in (name, "ALL"):
+            if error is None:
+                latencies[key].append(latency)
+            else:
+                errors[key][error] += 1
+
+    n_errors = sum(errors["ALL"].values())
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {elapsed:.2f} s -> "
+          f"{args.requests / elapsed:.1f} req/s, {n_errors} failed\n")
+    print(f"{'endpoint':<18} {'count':>6} {'errors':>7} {'p50 ms':>9} {'p99 ms':>9}")
+    for name in sorted(set(latencies) | set(errors)):
+        values = np.array(latencies[name]) * 1000
+        p50, p99 = (np.percentile(values, [50, 99]) if len(values) else (np.nan, np.nan))
+        n_failed = sum(errors[name].values())
+        print(f"{name:<18} {len(values) + n_failed:>6} {n_failed:>7} {p50:>9.1f} {p99:>9.1f}")
+
+    if n_errors:
+        print("\nFailures (latencies above cover successful requests only):")
+        for name in sorted(errors):
+            if name != "ALL":
+                for error, count in sorted(errors[name].items(), key=str):
+                    print(f"  {name:<18} {error}: {count}")
+
+
+if __name__ == "__main__":
+    main()
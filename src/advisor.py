@@ -6,28 +6,32 @@ from groq import Groq
 # Add src to path if running directly
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from loader import DataLoader
+from loader import DataLoader, ANALYSIS_COLUMNS
 from analytics import FinancialAnalyzer
 from rag import BudgetRAG
 
 load_dotenv()
 
 class FinancialAdvisor:
-    def __init__(self, df=None):
-        # Initialize Components
-        self.client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-        self.rag = BudgetRAG()
+    def __init__(self, df=None, rag=None, client=None):
+        # Initialize Components (pass already-loaded ones in to reuse them across requests)
+        self.client = client if client is not None else Groq(api_key=os.getenv("GROQ_API_KEY"))
+        self.rag = rag if rag is not None else BudgetRAG()
         
-        # Load Data
-        if df is not None:
-            self.df = df
-        else:
-            base_dir = os.path.dirname(os.path.abspath(__file__))
-            dataset_path = os.path.join(base_dir, "../Datasets/Personal_Finance_Data_1.xlsx")
-            loader = DataLoader()
-            self.df = loader.run_pipeline(dataset_path)
-            
-        self.analyzer = FinancialAnalyzer(self.df)
+        self.df = df
+        self._analyzer = None
+
+    @property
+    def analyzer(self):
+        # Data is loaded on first use, so an advisor fed precomputed reports never loads any
+        if self._analyzer is None:
+            if self.df is None:
+                base_dir = os.path.dirname(os.path.abspath(__file__))
+                dataset_path = os.path.join(base_dir, "../Datasets/Personal_Finance_Data_1.xlsx")
+                loader = DataLoader(columns=ANALYSIS_COLUMNS)
+                self.df = loader.run_pipeline(dataset_path)
+            self._analyzer = FinancialAnalyzer(self.df)
+        return self._analyzer
 
     def generate_prompt(self, analysis, context_strategies):
         """
@@ -44,6 +48,25 @@ class FinancialAdvisor:
                 items.append(f"- {cat}: Current ${data['current']:.0f} (Avg ${data['average']:.0f}) -> +{data['pct_over']:.1f}% higher")
             overspending_text = "\n".join(items)
 
+        # Format Forecast text
+        forecast = analysis.get('Cash Flow Forecast', {})
+        forecast_text = "No forecast available."
+        if forecast:
+            forecast_text = "\n".join([
+                f"- {month}: Income ${data['Income']:,.0f}, Expenses ${data['Expense']:,.0f}, Savings ${data['Savings']:,.0f}"
+                for month, data in forecast.items()
+            ])
+
+        # Format Savings Simulation text
+        simulation = analysis.get('Savings Simulation (12 Months)', {})
+        simulation_text = "No simulation available."
+        if simulation:
+            simulation_text = "\n".join([
+                f"- {name}: median ${data['p50']:,.0f} (5th-95th percentile ${data['p5']:,.0f} to ${data['p95']:,.0f}), "
+                f"{data['prob_positive'] * 100:.0f}% chance of a positive balance"
+                for name, data in simulation.items()
+            ])
+
         # Context from RAG
         strategies_text = "\n".join([f"- {s}" for s in context_strategies])
 
@@ -58,10 +81,16 @@ class FinancialAdvisor:
         ### 2. CRITICAL ALERTS (OVERSPENDING)
         {overspending_text}
 
-        ### 3. PROVEN BUDGETING STRATEGIES (Reference these in your advice)
+        ### 3. CASH FLOW FORECAST (Next Months)
+        {forecast_text}
+
+        ### 4. SAVINGS SCENARIOS (Monte Carlo over the next 12 months, resampled from history)
+        {simulation_text}
+
+        ### 5. PROVEN BUDGETING STRATEGIES (Reference these in your advice)
         {strategies_text}
 
-        ### 4. YOUR TASK
+        ### 6. YOUR TASK
         Based on the data above, provide a comprehensive financial plan:
         
         **A. Executive Summary**
@@ -74,7 +103,7 @@ class FinancialAdvisor:
         In bullet list propose a specific strategy from the provided list (e.g., 50/30/20 or Zero-Based) that fits this user's situation. Explain WHY.
 
         **D. Savings Roadmap**
-        Tabulate and calculate if they can become positive next month by cutting the 'Recoverable Waste' mentioned in the overspending section.
+        Tabulate and calculate if they can become positive next month by cutting the 'Recoverable Waste' mentioned in the overspending section, using the cash flow forecast as the starting point and the savings scenarios to show which changes make the biggest difference.
 
         **E. Habit Building**
         In bullet list suggest one simple daily or weekly habit to improve financial discipline.
@@ -83,9 +112,13 @@ class FinancialAdvisor:
         """
         return prompt
 
-    def get_advice(self):
-        print("Running Financial Analysis...")
-        report = self.analyzer.generate_full_report()
+    def get_advice(self, report=None):
+        """
+        Generates advice for `report`, or for this advisor's own data when no report is given.
+        """
+        if report is None:
+            print("Running Financial Analysis...")
+            report = self.analyzer.generate_full_report()
         
         print("Retrieving Relevant Budgeting Strategies...")
         # Construct a query based on the analysis
@@ -2,49 +2,114 @@ import os
 import pandas as pd
 import numpy as np
 from loader import DataLoader
-from categorizer import Categorizer
+from categorizer import Categorizer, match_labels
+from anomaly import AnomalyDetector
+from forecast import CashFlowForecaster
+from cube import AggregateCube
+from simulator import SavingsSimulator
 
 class FinancialAnalyzer:
     def __init__(self, df):
-        self.df = df
+        # Shallow copy: shares the caller's column data, and replacing a column below
+        # swaps it in this frame only, so the caller's df is never modified
+        self.df = df.copy(deep=False)
 
-        # Custom Rule: 'Other' category is treated as Income source
-        if 'category' in self.df.columns and 'type' in self.df.columns:
-             self.df.loc[self.df['category'].str.title() == 'Other', 'type'] = 'Income'
-
-        self.income_df = df[df['type'].str.lower() == 'income'].copy()
-        self.expense_df = df[df['type'].str.lower() == 'expense'].copy()
-        
         # Ensure date is datetime
         if 'date' in self.df.columns and not pd.api.types.is_datetime64_any_dtype(self.df['date']):
              self.df['date'] = pd.to_datetime(self.df['date'])
 
+        self._income_mask, self._expense_mask = match_labels(self.df['type'], str.lower, 'income', 'expense')
+
+        # Custom Rule: 'Other' category is treated as Income source
+        if 'category' in self.df.columns:
+            other_mask = match_labels(self.df['category'], str.title, 'Other')[0]
+            if other_mask.any():
+                self.df['type'] = self.df['type'].mask(other_mask, 'Income')
+                self._income_mask = self._income_mask | other_mask
+                self._expense_mask = self._expense_mask & ~other_mask
+
+        # Income / expense frames are materialized on first access only
+        self._income_df = None
+        self._expense_df = None
+        # Shared by the report sections, built on first use
+        self._recurrent = {}
+        self._anomaly_detector = None
+        self._forecaster = None
+
+    @property
+    def income_df(self):
+        if self._income_df is None:
+            self._income_df = self.df[self._income_mask]
+        return self._income_df
+
+    @property
+    def expense_df(self):
+        if self._expense_df is None:
+            self._expense_df = self.df[self._expense_mask]
+        return self._expense_df
+
+    def _amounts(self):
+        """
+        Returns the amount column as a float array (a view when it is already float64).
+        """
+        return self.df['amount'].to_numpy(dtype=float)
+
+    def _masked_sum(self, mask):
+        amount = self._amounts()
+        return np.sum(amount, where=mask & ~np.isnan(amount))
+
+    def _rows(self, mask, columns=('date', 'category', 'amount')):
+        """
+        Selects only the columns a computation needs instead of whole income/expense frames.
+        """
+        return self.df.loc[mask, list(columns)]
+
     def get_basic_totals(self):
+        total_income = self._masked_sum(self._income_mask)
+        total_expenses = self._masked_sum(self._expense_mask)
         return {
-            "Total Income": self.income_df['amount'].sum(),
-            "Total Expenses": self.expense_df['amount'].sum(),
-            "Net Savings": self.income_df['amount'].sum() - self.expense_df['amount'].sum()
+            "Total Income": total_income,
+            "Total Expenses": total_expenses,
+            "Net Savings": total_income - total_expenses
         }
 
     def get_category_totals(self):
-        return self.expense_df.groupby('category')['amount'].sum().to_dict()
+        codes, categories = pd.factorize(self.df['category'], sort=True)
+        amount = self._amounts()
+        rows = self._expense_mask & (codes >= 0)
+
+        # NaN categories get code -1, so only rows with a category are counted (as groupby skips them)
+        weights = np.nan_to_num(amount[rows], nan=0.0)
+        totals = np.bincount(codes[rows], weights=weights, minlength=len(categories))
+        present = np.bincount(codes[rows], minlength=len(categories)) > 0
+        return dict(zip(categories[present], totals[present].tolist()))
 
     def get_monthly_trends(self):
         """
-        Resamples data by month to show trends.
+        Buckets data by month to show trends.
         """
-        # Ensure index is datetime for resampling
-        temp_income = self.income_df.set_index('date')
-        temp_expense = self.expense_df.set_index('date')
-        
-        monthly_income = temp_income.resample('ME')['amount'].sum() # 'ME' is Month End (pandas 2.x)
-        monthly_expense = temp_expense.resample('ME')['amount'].sum()
-        
-        # Combine into a DataFrame
+        # Month number per row, computed directly on the datetime array
+        months = self.df['date'].to_numpy().astype('datetime64[M]')
+        amount = self._amounts()
+        rows = (self._income_mask | self._expense_mask) & ~np.isnat(months)
+        if not rows.any():
+            return pd.DataFrame(columns=['Income', 'Expense', 'Savings'], dtype=float)
+
+        month_numbers = months.astype(np.int64)
+        first = month_numbers[rows].min()
+        n_months = month_numbers[rows].max() - first + 1
+        offsets = np.where(rows, month_numbers - first, 0)
+        valid = rows & ~np.isnan(amount)
+
+        def monthly_sum(mask):
+            return np.bincount(offsets, weights=np.where(valid & mask, amount, 0.0), minlength=n_months)
+
+        # Month End labels, matching resample('ME')
+        index = pd.date_range(pd.Timestamp(months[rows].min()), periods=n_months, freq='ME', name='date')
         trends = pd.DataFrame({
-            'Income': monthly_income,
-            'Expense': monthly_expense
-        }).fillna(0)
+            'Income': monthly_sum(self._income_mask),
+            'Expense': monthly_sum(self._expense_mask)
+        }, index=index)
         
         trends['Savings'] = trends['Income'] - trends['Expense']
         return trends
@@ -53,95 +118,136 @@ class FinancialAnalyzer:
         """
         Detects recurring expenses based on description and amount similarity.
         """
+        if min_occurences not in self._recurrent:
+            self._recurrent[min_occurences] = self._find_recurrent_charges(min_occurences)
+        return self._recurrent[min_occurences].copy()
+
+    def _find_recurrent_charges(self, min_occurences):
+        expenses = self._rows(self._expense_mask, ('transaction_description', 'amount', 'date', 'category'))
+
         # Group by description and amount (rounded to avoid small discrepancies)
-        self.expense_df['amount_rounded'] = self.expense_df['amount'].round(0)
-        
-        group = self.expense_df.groupby(['transaction_description', 'amount_rounded']).size().reset_index(name='count')
-        recurrent = group[group['count'] >= min_occurences]
-        
-        # Get details
-        results = []
-        for _, row in recurrent.iterrows():
-            matches = self.expense_df[
-                (self.expense_df['transaction_description'] == row['transaction_description']) & 
-                (self.expense_df['amount_rounded'] == row['amount_rounded'])
-            ]
-            avg_days_diff = matches['date'].sort_values().diff().dt.days.mean()
-            
-            # If it happens roughly every 28-31 days, it's likely a monthly subscription
-            interval = "Irregular"
-            if 28 <= avg_days_diff <= 32:
-                 interval = "Monthly"
-            
-            results.append({
-                "description": row['transaction_description'],
-                "amount": row['amount_rounded'],
-                "frequency": row['count'],
-                "estimated_interval": interval
-            })
-            
-        return pd.DataFrame(results)
+        keys = [expenses['transaction_description'], expenses['amount'].round(0).rename('amount_rounded')]
+        grouped = expenses.groupby(keys)
+        stats = grouped['date'].agg(['size', 'count', 'min', 'max'])
+        stats['category'] = grouped['category'].first()
+        recurrent = stats[stats['size'] >= min_occurences]
+        if recurrent.empty:
+            return pd.DataFrame()
+
+        # Mean gap between sorted dates telescopes to (last - first) / (n - 1)
+        span_days = (recurrent['max'] - recurrent['min']).dt.total_seconds() / 86400
+        avg_days_diff = span_days / (recurrent['count'] - 1)
+
+        # If it happens roughly every 28-31 days, it's likely a monthly subscription
+        interval = np.where((avg_days_diff >= 28) & (avg_days_diff <= 32), "Monthly", "Irregular")
+
+        return pd.DataFrame({
+            "description": recurrent.index.get_level_values('transaction_description'),
+            "amount": recurrent.index.get_level_values('amount_rounded'),
+            "category": recurrent['category'].to_numpy(),
+            "frequency": recurrent['size'].to_numpy(),
+            "estimated_interval": interval
+        })
+
+    def _get_anomaly_detector(self):
+        """
+        Builds the month x category matrix once and reuses it for every alert query.
+        """
+        if self._anomaly_detector is None:
+            self._anomaly_detector = AnomalyDetector(self._rows(self._expense_mask))
+        return self._anomaly_detector
+
+    def _get_forecaster(self):
+        """
+        Income / expense month x category matrices, reusing the anomaly detector's expense matrix.
+        """
+        if self._forecaster is None:
+            income = AnomalyDetector.build_matrix(self._rows(self._income_mask))
+            self._forecaster = CashFlowForecaster.from_matrices(income, self._get_anomaly_detector().matrix)
+        return self._forecaster
 
     def check_overspending(self, threshold_factor=1.2):
         """
         Flags categories where the latest month's spending is significantly higher than the average.
         """
-        if self.expense_df.empty:
+        if not self._expense_mask.any():
             return {}
 
-        # 1. Calculate Monthly Spending per Category
-        temp_df = self.expense_df.copy()
-        temp_df['month'] = temp_df['date'].dt.to_period('M')
-        
-        monthly_cat_spend = temp_df.groupby(['category', 'month'])['amount'].sum().reset_index()
-        
-        # 2. Calculate Average per Category (excluding latest month to avoid skewing?)
-        # Let's just use all-time average for simplicity
-        avg_spend = monthly_cat_spend.groupby('category')['amount'].mean()
-        
-        # 3. Check Latest Month
-        latest_month = temp_df['month'].max()
-        latest_spend = monthly_cat_spend[monthly_cat_spend['month'] == latest_month].set_index('category')['amount']
-        
-        overspending = {}
-        for cat in latest_spend.index:
-            avg = avg_spend.get(cat, 0)
-            current = latest_spend[cat]
-            if current > (avg * threshold_factor):
-                overspending[cat] = {
-                    "current": current,
-                    "average": avg,
-                    "pct_over": ((current - avg) / avg) * 100 if avg > 0 else 100
-                }
-        return overspending
+        return self._get_anomaly_detector().latest_vs_average(threshold_factor=threshold_factor)
+
+    def detect_anomalies(self, window=6, min_periods=3, threshold=3.0, method='mad'):
+        """
+        Flags unusual category-months across the whole history against rolling baselines
+        (median + MAD by default) computed in one vectorized pass.
+        """
+        return self._get_anomaly_detector().detect(
+            window=window, min_periods=min_periods, threshold=threshold, method=method
+        )
+
+    def forecast_cash_flow(self, horizon=6, method='ses'):
+        """
+        Projects monthly Income, Expense and Savings for the next `horizon` months,
+        fitting every category at once ('seasonal_naive', 'ses' or 'linear').
+        """
+        return self._get_forecaster().summary(horizon=horizon, method=method)
+
+    def build_cube(self):
+        """
+        Materializes the type x category x month aggregate cube for fast date-range / category slicing.
+        """
+        return AggregateCube(self.df)
+
+    def build_simulator(self):
+        """
+        Monte Carlo what-if simulator over the month x category history, with the spending from
+        detected monthly recurring charges tracked per month so cancelling only removes
+        the charges a resampled month actually contained.
+        """
+        forecaster = self._get_forecaster()
+        recurrent = self.detect_recurrent_charges()
+        recurring = None
+        if not recurrent.empty:
+            monthly = recurrent[recurrent['estimated_interval'] == "Monthly"]
+            expenses = self._rows(self._expense_mask, ('transaction_description', 'amount', 'date', 'category'))
+            # Same (description, rounded amount) key as detect_recurrent_charges
+            keys = pd.MultiIndex.from_arrays([expenses['transaction_description'], expenses['amount'].round(0)])
+            is_recurring = keys.isin(pd.MultiIndex.from_arrays([monthly['description'], monthly['amount']]))
+            recurring = AnomalyDetector.build_matrix(expenses[is_recurring])
+        return SavingsSimulator(forecaster.expense, forecaster.income.sum(axis=1), recurring)
 
     def calculate_savings_potential(self):
         """
-        Simple potential: Net Savings + Waste (Overspending).
+        Simple potential: Monthly Average Savings + Waste (Overspending), both monthly figures.
         """
         totals = self.get_basic_totals()
         overspending = self.check_overspending()
+        avg_monthly_savings = self.get_monthly_trends()['Savings'].mean()
         
         recoverable_waste = sum([item['current'] - item['average'] for item in overspending.values()])
         
         return {
             "Current Net Savings": totals['Net Savings'],
             "Recoverable Waste (Overspending)": recoverable_waste,
-            "Potential Monthly Savings": totals['Net Savings'] + recoverable_waste 
-            # Note: This adds 'waste' (which is monthly) to Total Net Savings (which is global). 
-            # Ideally should be monthly. Let's adjust to Monthly Average.
+            "Potential Monthly Savings": avg_monthly_savings + recoverable_waste
         }
     
     def generate_full_report(self):
         trends = self.get_monthly_trends()
         avg_monthly_savings = trends['Savings'].mean()
+        forecast = self.forecast_cash_flow()
+        forecast.index = forecast.index.astype(str)
+        overspending = self.check_overspending()
+        simulation = self.build_simulator().preset_scenarios(overspending_categories=list(overspending))
         
         return {
             "Totals": self.get_basic_totals(),
             "Monthly Average Savings": avg_monthly_savings,
             "Recurrent Charges": self.detect_recurrent_charges().to_dict('records'),
-            "Overspending Alerts (Latest Month)": self.check_overspending(),
-            "Category Totals": self.get_category_totals()
+            "Overspending Alerts (Latest Month)": overspending,
+            "Anomaly Timeline": self.detect_anomalies().to_dict('records'),
+            "Category Totals": self.get_category_totals(),
+            "Cash Flow Forecast": forecast.to_dict('index'),
+            "Savings Simulation (12 Months)": simulation.to_dict('index')
         }
 
 # def main():
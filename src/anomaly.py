@@ -0,0 +1,135 @@
+import warnings
+import pandas as pd
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from categorizer import UNCATEGORIZED
+
+# Smallest spread a baseline may have, as a fraction of its center plus an absolute amount,
+# so a flat history (rent, subscriptions) still flags a clear jump instead of dividing by 0
+MIN_SCALE_FRACTION = 0.05
+MIN_SCALE = 1.0
+
+
+class AnomalyDetector:
+    def __init__(self, expense_df, date_col='date', category_col='category', amount_col='amount'):
+        """
+        Builds the month x category spending matrix once from the expense rows.
+        Months where a category has no spending are kept as NaN (inactive), not 0.
+        """
+        self.matrix = self.build_matrix(expense_df, date_col, category_col, amount_col)
+
+    @staticmethod
+    def build_matrix(expense_df, date_col='date', category_col='category', amount_col='amount'):
+        """
+        Aggregates expenses into a (month x category) DataFrame in one grouped pass.
+        Rows without a category are kept under UNCATEGORIZED, so the row totals match the data.
+        """
+        if expense_df.empty:
+            return pd.DataFrame(dtype=float)
+
+        months = expense_df[date_col].dt.to_period('M')
+        categories = expense_df[category_col]
+        if categories.isna().any():
+            categories = categories.astype(object).fillna(UNCATEGORIZED)
+        matrix = expense_df.groupby([months, categories])[amount_col].sum().unstack()
+
+        # Fill in calendar gaps so rolling windows always span real months
+        full_range = pd.period_range(matrix.index.min(), matrix.index.max(), freq='M')
+        return matrix.reindex(full_range).astype(float)
+
+    def rolling_baseline(self, window=6, min_periods=3, method='mad'):
+        """
+        Computes a baseline (center) and spread (scale) for every month and category
+        from the preceding `window` months, excluding the month itself.
+        method='mad' uses rolling median + MAD, method='zscore' uses rolling mean + std.
+        Returns (center, scale) as DataFrames shaped like the matrix.
+        """
+        values = self.matrix.to_numpy()
+        n_months, n_cats = values.shape
+
+        # Pad with `window` empty months so row t sees only months t-window .. t-1
+        padded = np.vstack([np.full((window, n_cats), np.nan), values])
+        windows = sliding_window_view(padded, window, axis=0)[:n_months]  # (months, categories, window)
+        observed = np.sum(~np.isnan(windows), axis=-1)
+
+        with warnings.catch_warnings():
+            # All-NaN windows (first months, inactive categories) are expected here
+            warnings.simplefilter('ignore', RuntimeWarning)
+            if method == 'mad':
+                center = np.nanmedian(windows, axis=-1)
+                deviation = np.abs(windows - center[..., None])
+                scale = 1.4826 * np.nanmedian(deviation, axis=-1)
+                # MAD collapses to 0 when over half the window is identical; fall back to mean absolute deviation
+                mean_abs = 1.2533 * np.nanmean(deviation, axis=-1)
+                scale = np.where(scale > 0, scale, mean_abs)
+            elif method == 'zscore':
+                center = np.nanmean(windows, axis=-1)
+                scale = np.nanstd(windows, axis=-1)
+            else:
+                raise ValueError(f"Unknown baseline method: {method}")
+
+        scale = np.maximum(scale, MIN_SCALE_FRACTION * np.abs(center) + MIN_SCALE)
+        insufficient = observed < min_periods
+        center[insufficient] = np.nan
+        scale[insufficient] = np.nan
+
+        return (
+            pd.DataFrame(center, index=self.matrix.index, columns=self.matrix.columns),
+            pd.DataFrame(scale, index=self.matrix.index, columns=self.matrix.columns),
+        )
+
+    def detect(self, window=6, min_periods=3, threshold=3.0, method='mad', min_pct_over=0):
+        """
+        Flags every category-month across the full history whose spending sits more than
+        `threshold` scaled deviations above its rolling baseline.
+        Returns a DataFrame with one row per flagged category-month, oldest first.
+        """
+        columns = ['month', 'category', 'amount', 'baseline', 'score', 'pct_over']
+        if self.matrix.empty:
+            return pd.DataFrame(columns=columns)
+
+        center, scale = self.rolling_baseline(window=window, min_periods=min_periods, method=method)
+        values = self.matrix.to_numpy()
+        center_values = center.to_numpy()
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            score = (values - center_values) / scale.to_numpy()
+            pct_over = np.where(center_values > 0, (values - center_values) / center_values * 100, 100.0)
+
+        flagged = (score > threshold) & (pct_over >= min_pct_over)
+        month_idx, cat_idx = np.nonzero(flagged)
+
+        return pd.DataFrame({
+            'month': self.matrix.index[month_idx].astype(str),
+            'category': self.matrix.columns[cat_idx],
+            'amount': values[month_idx, cat_idx],
+            'baseline': center_values[month_idx, cat_idx],
+            'score': score[month_idx, cat_idx],
+            'pct_over': pct_over[month_idx, cat_idx],
+        }, columns=columns)
+
+    def latest_vs_average(self, threshold_factor=1.2):
+        """
+        Compares the latest month against each category's all-time monthly average.
+        Returns the same structure as FinancialAnalyzer.check_overspending.
+        """
+        if self.matrix.empty:
+            return {}
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            avg = np.nanmean(self.matrix.to_numpy(), axis=0)
+        current = self.matrix.iloc[-1].to_numpy()
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            pct_over = np.where(avg > 0, (current - avg) / avg * 100, 100.0)
+        flagged = np.nonzero(~np.isnan(current) & (current > avg * threshold_factor))[0]
+
+        return {
+            self.matrix.columns[i]: {
+                "current": current[i],
+                "average": avg[i],
+                "pct_over": pct_over[i]
+            }
+            for i in flagged
+        }
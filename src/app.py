@@ -1,18 +1,23 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import os
 import sys
 
 # Add src to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from loader import DataLoader
+from loader import DataLoader, FileLimitError, ANALYSIS_COLUMNS
 from analytics import FinancialAnalyzer
 from advisor import FinancialAdvisor
 
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+# Upload limits, enforced while parsing
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+MAX_UPLOAD_ROWS = 2_000_000
+
 st.set_page_config(
     page_title="FinSight AI",
     layout="wide",
@@ -73,46 +78,78 @@ if os.path.exists(dataset_dir):
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet" if filename.endswith(".xlsx") else "text/csv"
             )
 
-# Use default dataset if no file uploaded
+def load_dataset(uploaded_file):
+    """
+    Loads and cleans the demo dataset or the uploaded file.
+    """
+    # Use default dataset if no file uploaded
+    if uploaded_file is None:
+        # Load demo data
+        try:
+            base_dir = os.path.dirname(os.path.abspath(__file__))
+            dataset_path = os.path.join(base_dir, "../Datasets/Personal_Finance_Dataset.xlsx")
+            loader = DataLoader(columns=ANALYSIS_COLUMNS)
+            return loader.run_pipeline(dataset_path)
+        except Exception as e:
+            st.error(f"Could not load demo data: {e}")
+            st.stop()
+    else:
+        # Handle File Upload through the same pipeline as the demo data, parsed in chunks
+        progress = st.progress(0.0, text="Reading upload...")
+        try:
+            loader = DataLoader(columns=ANALYSIS_COLUMNS, max_bytes=MAX_UPLOAD_BYTES, max_rows=MAX_UPLOAD_ROWS)
+            df = loader.run_pipeline(
+                uploaded_file,
+                progress_callback=lambda fraction, message: progress.progress(fraction, text=message)
+            )
+            progress.empty()
+            return df
+        except FileLimitError as e:
+            progress.empty()
+            st.error(f"Upload rejected: {e}")
+            st.stop()
+        except Exception as e:
+            progress.empty()
+            st.error(f"Error processing file: {e}")
+            st.stop()
+
 if uploaded_file is None:
     st.info("👆Showing demo data for now. Upload your own financial data to get started.")
-    # Load demo data
-    try:
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        dataset_path = os.path.join(base_dir, "../Datasets/Personal_Finance_Dataset.xlsx")
-        loader = DataLoader()
-        # DataLoader expects a path, so we use it directly.
-        df = loader.run_pipeline(dataset_path)
-    except Exception as e:
-        st.error(f"Could not load demo data: {e}")
-        st.stop()
+
+# Load, analyze and build the aggregate cube once per dataset; filter changes only query the cube
+dataset_key = "demo" if uploaded_file is None else uploaded_file.file_id
+if st.session_state.get('dataset_key') != dataset_key:
+    df = load_dataset(uploaded_file)
+    analyzer = FinancialAnalyzer(df)
+    st.session_state.update(
+        dataset_key=dataset_key,
+        df=df,
+        analyzer=analyzer,
+        report=analyzer.generate_full_report(),
+        cube=analyzer.build_cube(),
+        simulator=None
+    )
+
+df = st.session_state['df']
+analyzer = st.session_state['analyzer']
+report = st.session_state['report']
+cube = st.session_state['cube']
+
+# Dashboard filters
+st.sidebar.markdown("---")
+st.sidebar.header("Filters")
+month_labels = [str(month) for month in cube.months]
+if month_labels:
+    start_month, end_month = st.sidebar.select_slider(
+        "Date Range", options=month_labels, value=(month_labels[0], month_labels[-1])
+    )
 else:
-    # Handle File Upload
-    try:
-        if uploaded_file.name.endswith('.csv'):
-            df = pd.read_csv(uploaded_file)
-        else:
-            df = pd.read_excel(uploaded_file)
-        
-        # We need to clean/normalize this uploaded DF similar to DataLoader
-        # For simplicity, let's reinstantiate DataLoader methods manually or update DataLoader to accept DF
-        # Re-using DataLoader logic by mocking it or calling methods
-        loader = DataLoader()
-        df = loader.clean_column_names(df)
-        df = loader.remove_duplicates(df)
-        # Assuming standard column names exist or user maps them.
-        # For this prototype, we assume format matches.
-        df = loader.parse_dates(df, date_col='date') 
-        # df = loader.standardize_amounts(df, amount_col='amount')
-        
-    except Exception as e:
-        st.error(f"Error processing file: {e}")
-        st.stop()
-
-# Initialize Analyzer
-analyzer = FinancialAnalyzer(df)
-report = analyzer.generate_full_report()
-totals = report['Totals']
+    start_month, end_month = None, None
+all_categories = list(cube.categories)
+selected_categories = st.sidebar.multiselect("Categories", options=all_categories, default=all_categories)
+
+totals = cube.totals(start_month, end_month, selected_categories)
+trends = cube.trends(start_month, end_month, selected_categories)
 
 # --- Dashboard Layout ---
 
@@ -127,7 +164,8 @@ with col3:
     color = "normal" if net >= 0 else "inverse"
     st.metric("Net Debt", f"${net:,.2f}", delta_color=color)
 with col4:
-    st.metric("Avg Monthly Debt", f"${report['Monthly Average Savings']:,.2f}")
+    avg_monthly_savings = trends['Savings'].mean() if not trends.empty else 0.0
+    st.metric("Avg Monthly Debt", f"${avg_monthly_savings:,.2f}")
 
 st.divider()
 
@@ -137,10 +175,11 @@ col_chart1, col_chart2 = st.columns(2)
 with col_chart1:
     st.subheader("Expense Breakdown")
     fig1, ax1 = plt.subplots(figsize=(8, 4))
-    expenses = pd.Series(report['Category Totals'])
+    expenses = pd.Series(cube.category_totals(start_month, end_month, selected_categories), dtype=float)
     # Sort and limit
     expenses = expenses.sort_values(ascending=False).head(10)
-    sns.barplot(x=expenses.values, y=expenses.index, ax=ax1, palette="viridis")
+    if not expenses.empty:
+        sns.barplot(x=expenses.values, y=expenses.index, ax=ax1, palette="viridis")
     ax1.set_xlabel("Amount")
     ax1.set_ylabel("Category")
     ax1.set_title("Top 10 Expense Categories")
@@ -149,17 +188,24 @@ with col_chart1:
 with col_chart2:
     st.subheader("Monthly Trends")
     fig2, ax2 = plt.subplots(figsize=(8, 4))
-    trends = analyzer.get_monthly_trends()
     sns.lineplot(data=trends[['Income', 'Expense']], ax=ax2, markers=True)
     ax2.set_xlabel("Month")
     ax2.set_ylabel("Amount")
     ax2.set_title("Monthly Income vs. Expenses")
     st.pyplot(fig2)
 
+st.subheader("📈 Cash Flow Forecast")
+forecast = pd.DataFrame.from_dict(report['Cash Flow Forecast'], orient='index')
+if not forecast.empty:
+    st.line_chart(forecast[['Income', 'Expense', 'Savings']])
+else:
+    st.info("Not enough history to forecast.")
+
 st.divider()
 
 # 3. Insights Section
 st.subheader("⚠️ Risk Analysis")
+st.caption("Alerts and the AI plan use your full history, regardless of the filters above.")
 
 # Overspending
 with st.expander("Overspending Alerts", expanded=True):
@@ -170,6 +216,15 @@ with st.expander("Overspending Alerts", expanded=True):
     else:
         st.success("Spending is within average limits.")
 
+# Full-history anomalies
+with st.expander("Anomaly Timeline", expanded=False):
+    anomalies = pd.DataFrame(report['Anomaly Timeline'])
+    if not anomalies.empty:
+        st.bar_chart(anomalies.groupby('month').size().rename("Flagged Categories"))
+        st.dataframe(anomalies.sort_values('month', ascending=False), use_container_width=True)
+    else:
+        st.success("No unusual category-months found in your history.")
+
 # # Recurrent
 # with st.expander("Recurrent Charges", expanded=True):
 #     recurrent = report['Recurrent Charges']
@@ -181,6 +236,56 @@ with st.expander("Overspending Alerts", expanded=True):
 
 st.divider()
 
+# 4. What-if Simulator
+st.subheader("🎯 What-if Savings Simulator")
+st.caption("Monte Carlo over the next months, resampling your historical monthly spending and income.")
+
+simulator = st.session_state.get('simulator')
+if simulator is None:
+    simulator = analyzer.build_simulator()
+    st.session_state['simulator'] = simulator
+
+col_sim1, col_sim2 = st.columns(2)
+with col_sim1:
+    cut_categories = st.multiselect("Categories to cut", options=list(simulator.categories),
+                                    default=list(report['Overspending Alerts (Latest Month)']))
+    cut_pct = st.slider("Cut spending in those categories by (%)", 0, 100, 20)
+    cancel_recurring = st.checkbox("Cancel detected recurring charges")
+with col_sim2:
+    income_change = st.slider("Income change (%)", -50, 50, 0)
+    horizon = st.slider("Horizon (months)", 1, 36, 12)
+
+cuts = simulator.cut_vector({cat: cut_pct / 100 for cat in cut_categories})
+scenarios = simulator.simulate(
+    cuts=[cuts * 0, cuts],
+    cancel_recurring=[False, cancel_recurring],
+    income_shock=[1.0, 1 + income_change / 100],
+    horizon=horizon, seed=0
+)
+baseline, plan = scenarios.iloc[0], scenarios.iloc[1]
+
+col_m1, col_m2, col_m3 = st.columns(3)
+with col_m1:
+    st.metric("Median Balance", f"${plan['p50']:,.0f}", delta=f"{plan['p50'] - baseline['p50']:,.0f} vs. no changes")
+with col_m2:
+    st.metric("Range (5th-95th pct)", f"${plan['p5']:,.0f} to ${plan['p95']:,.0f}")
+with col_m3:
+    st.metric("Chance of Positive Balance", f"{plan['prob_positive'] * 100:.0f}%",
+              delta=f"{(plan['prob_positive'] - baseline['prob_positive']) * 100:.0f} pts")
+
+# Sweep every cut level at once to show how the odds change
+sweep_levels = np.arange(0, 101, 5)
+sweep = simulator.simulate(
+    cuts=np.outer(sweep_levels / 100, cuts > 0),
+    cancel_recurring=cancel_recurring,
+    income_shock=1 + income_change / 100,
+    horizon=horizon, seed=0
+)
+sweep.index = sweep_levels
+st.line_chart(sweep['prob_positive'].rename("Chance of positive balance by cut (%)"))
+
+st.divider()
+
 st.subheader("🤖 AI Financial Advisor")
 st.caption("Powered by OpenAI & RAG Knowledge Base")
 
@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 import os
 
 try:
@@ -9,6 +10,25 @@ except ImportError:
     VISUALIZATION_AVAILABLE = False
 
 
+# Label given to transactions without a category wherever they are aggregated per category
+UNCATEGORIZED = 'Uncategorized'
+
+
+def match_labels(series, normalize, *labels):
+    """
+    Returns one boolean mask per label, marking rows whose normalized value equals it.
+    The column is factorized once so `normalize` runs on distinct values only, not every row.
+    """
+    codes, uniques = pd.factorize(series)
+    normalized = [normalize(str(value)) for value in uniques]
+    masks = []
+    for label in labels:
+        # Extra trailing False so missing values (code -1) never match
+        matches = np.array([value == label for value in normalized] + [False], dtype=bool)
+        masks.append(matches[codes])
+    return masks
+
+
 class Categorizer:
     def __init__(self, df):
         """
@@ -17,6 +37,7 @@ class Categorizer:
         """
         self.df = df
         self._ensure_columns()
+        self._income_mask, self._expense_mask = match_labels(self.df['type'], str.title, 'Income', 'Expense')
 
     def _ensure_columns(self):
         """
@@ -34,23 +55,23 @@ class Categorizer:
             income_df (pd.DataFrame): Rows where Type is 'Income'
             expense_df (pd.DataFrame): Rows where Type is 'Expense'
         """
-        income_df = self.df[self.df['type'].str.title() == 'Income'].copy()
-        expense_df = self.df[self.df['type'].str.title() == 'Expense'].copy()
-        return income_df, expense_df
+        return self.df[self._income_mask], self.df[self._expense_mask]
 
     def get_summary(self):
         """
         Generates a summary dictionary of financial health.
         """
-        income_df, expense_df = self.categorize_data()
+        # Select only the two columns needed rather than materializing full frames
+        income_amount = self.df['amount'][self._income_mask]
+        expense_amount = self.df['amount'][self._expense_mask]
         
-        total_income = income_df['amount'].sum()
-        total_expense = expense_df['amount'].sum()
+        total_income = income_amount.sum()
+        total_expense = expense_amount.sum()
         net_savings = total_income - total_expense
         
         # Group by category
-        income_by_category = income_df.groupby('category')['amount'].sum().to_dict()
-        expense_by_category = expense_df.groupby('category')['amount'].sum().to_dict()
+        income_by_category = income_amount.groupby(self.df['category'][self._income_mask]).sum().to_dict()
+        expense_by_category = expense_amount.groupby(self.df['category'][self._expense_mask]).sum().to_dict()
         
         summary = {
             "Total Income": total_income,
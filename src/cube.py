@@ -0,0 +1,154 @@
+import pandas as pd
+import numpy as np
+from categorizer import match_labels, UNCATEGORIZED
+
+TYPES = ['Income', 'Expense']
+
+
+class AggregateCube:
+    def __init__(self, df, date_col='date', category_col='category', amount_col='amount', type_col='type'):
+        """
+        Materializes a (type x category x month) cube of sums, counts, mins and maxes in one pass.
+        Sums and counts are stored as cumulative sums along time, and mins/maxes as sparse tables,
+        so any date range + category subset is answered in O(categories), independent of row count.
+        """
+        type_masks = match_labels(df[type_col], str.title, *TYPES)
+        type_idx = np.full(len(df), -1)
+        for i, mask in enumerate(type_masks):
+            type_idx[mask] = i
+
+        # Uncategorized rows get their own bucket so unfiltered totals match the analyzer
+        category_values = df[category_col]
+        if category_values.isna().any():
+            category_values = category_values.astype(object).fillna(UNCATEGORIZED)
+        cat_codes, categories = pd.factorize(category_values, sort=True)
+        months = df[date_col].to_numpy().astype('datetime64[M]')
+        amount = df[amount_col].to_numpy(dtype=float)
+        rows = (type_idx >= 0) & (cat_codes >= 0) & ~np.isnat(months) & ~np.isnan(amount)
+
+        self.categories = pd.Index(categories)
+        if not rows.any():
+            self.months = pd.PeriodIndex([], freq='M')
+            shape = (len(TYPES), len(categories), 0)
+        else:
+            month_numbers = months[rows].astype(np.int64)
+            first = month_numbers.min()
+            n_months = month_numbers.max() - first + 1
+            self.months = pd.period_range(pd.Period(months[rows].min(), freq='M'), periods=n_months, freq='M')
+            shape = (len(TYPES), len(categories), n_months)
+
+        # One flat cell id per row: (type, category, month)
+        n_cells = int(np.prod(shape))
+        flat = np.zeros(0, dtype=np.int64)
+        if n_cells:
+            flat = np.ravel_multi_index((type_idx[rows], cat_codes[rows], month_numbers - first), shape)
+        values = amount[rows]
+
+        sums = np.bincount(flat, weights=values, minlength=n_cells).reshape(shape)
+        counts = np.bincount(flat, minlength=n_cells).reshape(shape)
+        mins = np.full(n_cells, np.inf)
+        maxs = np.full(n_cells, -np.inf)
+        np.minimum.at(mins, flat, values)
+        np.maximum.at(maxs, flat, values)
+
+        # Prefix sums with a leading zero month: range total = cum[e + 1] - cum[s]
+        pad = [(0, 0), (0, 0), (1, 0)]
+        self._cum_sums = np.pad(np.cumsum(sums, axis=-1), pad)
+        self._cum_counts = np.pad(np.cumsum(counts, axis=-1), pad)
+        self._min_table = self._sparse_table(mins.reshape(shape), np.minimum)
+        self._max_table = self._sparse_table(maxs.reshape(shape), np.maximum)
+
+    @staticmethod
+    def _sparse_table(values, combine):
+        """
+        Level k holds the combined value of the 2**k months starting at each month.
+        """
+        table = [values]
+        span = 1
+        while 2 * span <= values.shape[-1]:
+            previous = table[-1]
+            table.append(combine(previous[..., :-span], previous[..., span:]))
+            span *= 2
+        return table
+
+    @staticmethod
+    def _range_query(table, combine, t, positions, start, end):
+        # Two overlapping power-of-two blocks cover [start, end] exactly
+        level = int(np.log2(end - start + 1))
+        block = table[level]
+        return combine(block[t, positions, start], block[t, positions, end - (1 << level) + 1])
+
+    def _month_bounds(self, start=None, end=None):
+        """
+        Converts start/end (anything pd.Period accepts, or None for open-ended) to month indices.
+        """
+        if not len(self.months):
+            return None
+        first, last = 0, len(self.months) - 1
+        if start is not None:
+            first = max(first, (pd.Period(start, freq='M') - self.months[0]).n)
+        if end is not None:
+            last = min(last, (pd.Period(end, freq='M') - self.months[0]).n)
+        return (first, last) if first <= last else None
+
+    def _category_positions(self, categories=None):
+        if categories is None:
+            return np.arange(len(self.categories))
+        positions = self.categories.get_indexer(list(categories))
+        return positions[positions >= 0]
+
+    def breakdown(self, start=None, end=None, categories=None, type_='Expense'):
+        """
+        Per-category sum, count, min and max for one transaction type over a date range.
+        """
+        columns = ['sum', 'count', 'min', 'max']
+        bounds = self._month_bounds(start, end)
+        positions = self._category_positions(categories)
+        if bounds is None or not len(positions):
+            return pd.DataFrame(columns=columns, dtype=float)
+
+        s, e = bounds
+        t = TYPES.index(type_.title())
+        counts = self._cum_counts[t, positions, e + 1] - self._cum_counts[t, positions, s]
+        result = pd.DataFrame({
+            'sum': self._cum_sums[t, positions, e + 1] - self._cum_sums[t, positions, s],
+            'count': counts,
+            'min': self._range_query(self._min_table, np.minimum, t, positions, s, e),
+            'max': self._range_query(self._max_table, np.maximum, t, positions, s, e),
+        }, index=self.categories[positions])
+        return result[counts > 0]
+
+    def totals(self, start=None, end=None, categories=None):
+        """
+        Same structure as FinancialAnalyzer.get_basic_totals, restricted to the range and categories.
+        """
+        total_income = self.breakdown(start, end, categories, 'Income')['sum'].sum()
+        total_expenses = self.breakdown(start, end, categories, 'Expense')['sum'].sum()
+        return {
+            "Total Income": total_income,
+            "Total Expenses": total_expenses,
+            "Net Savings": total_income - total_expenses
+        }
+
+    def category_totals(self, start=None, end=None, categories=None):
+        """
+        Same structure as FinancialAnalyzer.get_category_totals.
+        """
+        return self.breakdown(start, end, categories, 'Expense')['sum'].to_dict()
+
+    def trends(self, start=None, end=None, categories=None):
+        """
+        Same layout as FinancialAnalyzer.get_monthly_trends, restricted to the range and categories.
+        """
+        bounds = self._month_bounds(start, end)
+        if bounds is None:
+            return pd.DataFrame(columns=['Income', 'Expense', 'Savings'], dtype=float)
+
+        s, e = bounds
+        positions = self._category_positions(categories)
+        # Monthly values are consecutive differences of the prefix sums
+        monthly = np.diff(self._cum_sums[:, positions, s:e + 2], axis=-1).sum(axis=1)
+        index = self.months[s:e + 1].to_timestamp(how='end').normalize()
+        trends = pd.DataFrame({'Income': monthly[0], 'Expense': monthly[1]}, index=index.rename('date'))
+        trends['Savings'] = trends['Income'] - trends['Expense']
+        return trends
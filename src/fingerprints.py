@@ -0,0 +1,196 @@
+import json
+import math
+import os
+import pandas as pd
+import numpy as np
+
+
+def fingerprint_rows(df, date_col='date', description_col='transaction_description', amount_col='amount', type_col='type'):
+    """
+    Hashes the normalized (date, description, amount, type) of every row into a uint64.
+    Normalization makes re-exported statements match: dates are cut to the day, descriptions
+    are trimmed, lower-cased and whitespace-collapsed, amounts are rounded to cents.
+    Dates and amounts are cast to one dtype first, since hash_pandas_object hashes the int 15
+    and the float 15.0 (or the same date at s and ns resolution) differently.
+    Date and amount are required: hashing without them would merge distinct transactions.
+    """
+    missing = [col for col in (date_col, amount_col) if col not in df.columns]
+    if missing:
+        raise ValueError(f"DataFrame missing required column(s) for fingerprinting: {missing}")
+
+    key = pd.DataFrame(index=df.index)
+    key['date'] = pd.to_datetime(df[date_col], errors='coerce').dt.normalize().astype('datetime64[ns]')
+    if description_col in df.columns:
+        key['description'] = (df[description_col].astype(str).str.strip().str.lower()
+                              .str.replace(r'\s+', ' ', regex=True))
+    key['amount'] = pd.to_numeric(df[amount_col], errors='coerce').astype('float64').round(2)
+    if type_col in df.columns:
+        key['type'] = df[type_col].astype(str).str.strip().str.lower()
+
+    return pd.util.hash_pandas_object(key, index=False).to_numpy(dtype=np.uint64)
+
+
+class FingerprintStore:
+    """
+    Persistent set of row fingerprints kept in a directory:
+      meta.json         -- Bloom filter parameters and a dirty flag while bloom.bin lags the segments
+      bloom.bin         -- Bloom filter bit array (memory-mapped)
+      segments/*.npy    -- sorted uint64 fingerprint segments, one per import
+    Lookups touch only the pages needed for the queried hashes, so checking a statement
+    costs O(statement size), not O(history size).
+    """
+
+    def __init__(self, path, capacity=1_000_000, error_rate=0.01, use_bloom=True, max_segments=32):
+        self.path = path
+        self.segments_dir = os.path.join(path, "segments")
+        self.use_bloom = use_bloom
+        self.max_segments = max_segments
+        os.makedirs(self.segments_dir, exist_ok=True)
+
+        meta_path = os.path.join(path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                self.meta = json.load(f)
+        else:
+            self.meta = self._bloom_params(capacity, error_rate)
+            self._write_meta()
+
+        self._bloom = None
+        if self.use_bloom:
+            self._open_bloom()
+
+    @staticmethod
+    def _bloom_params(capacity, error_rate):
+        num_bits = int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        num_bits = max(64, (num_bits + 7) // 8 * 8)
+        num_hashes = max(1, int(round(num_bits / capacity * math.log(2))))
+        return {"capacity": capacity, "error_rate": error_rate, "num_bits": num_bits, "num_hashes": num_hashes, "count": 0}
+
+    def _write_meta(self):
+        tmp_path = os.path.join(self.path, "meta.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp_path, os.path.join(self.path, "meta.json"))
+
+    def _open_bloom(self):
+        bloom_path = os.path.join(self.path, "bloom.bin")
+        num_bytes = self.meta["num_bits"] // 8
+        stale = self.meta.get("bloom_dirty") or not os.path.exists(bloom_path)
+        if stale or os.path.getsize(bloom_path) != num_bytes:
+            self._bloom = None
+            np.zeros(num_bytes, dtype=np.uint8).tofile(bloom_path)
+            # A fresh filter must be refilled from the authoritative segments
+            self._bloom = np.memmap(bloom_path, dtype=np.uint8, mode='r+')
+            for segment in self._segments():
+                self._set_bits(np.asarray(segment))
+            self._bloom.flush()
+            self.meta["bloom_dirty"] = False
+            self._write_meta()
+        else:
+            self._bloom = np.memmap(bloom_path, dtype=np.uint8, mode='r+')
+
+    def _bit_positions(self, hashes):
+        """
+        k bit positions per hash via double hashing on the two 32-bit halves: (n, k) array.
+        """
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self.meta["num_hashes"], dtype=np.uint64)
+        return (h1[:, None] + steps[None, :] * h2[:, None]) % np.uint64(self.meta["num_bits"])
+
+    def _set_bits(self, hashes):
+        positions = self._bit_positions(hashes).ravel()
+        np.bitwise_or.at(self._bloom, positions >> np.uint64(3), (1 << (positions & np.uint64(7))).astype(np.uint8))
+
+    def _maybe_contains(self, hashes):
+        positions = self._bit_positions(hashes)
+        bits = self._bloom[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)
+        return np.all(bits & 1, axis=1)
+
+    def _segment_paths(self):
+        return sorted(os.path.join(self.segments_dir, name)
+                      for name in os.listdir(self.segments_dir) if name.endswith(".npy"))
+
+    def _segments(self):
+        for segment_path in self._segment_paths():
+            yield np.load(segment_path, mmap_mode='r')
+
+    def __len__(self):
+        return self.meta["count"]
+
+    def contains(self, hashes):
+        """
+        Returns a boolean array: True where the fingerprint is already in the store.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        found = np.zeros(len(hashes), dtype=bool)
+        candidates = np.arange(len(hashes))
+        if self.use_bloom and len(hashes):
+            # Bloom negatives are definite misses; only positives are checked against segments
+            candidates = candidates[self._maybe_contains(hashes)]
+
+        for segment in self._segments():
+            if not len(candidates) or not len(segment):
+                continue
+            pending = hashes[candidates]
+            slots = np.minimum(np.searchsorted(segment, pending), len(segment) - 1)
+            hit = segment[slots] == pending
+            found[candidates[hit]] = True
+            candidates = candidates[~hit]
+        return found
+
+    def add(self, hashes):
+        """
+        Records new fingerprints as one sorted segment (caller passes hashes not yet stored).
+        """
+        hashes = np.unique(np.asarray(hashes, dtype=np.uint64))
+        if not len(hashes):
+            return
+
+        # Segments and filter are updated separately; until both are done (or when the filter is
+        # disabled) it is marked dirty and rebuilt from the segments on the next Bloom-enabled open
+        self.meta["bloom_dirty"] = True
+        self._write_meta()
+
+        existing = self._segment_paths()
+        next_id = int(os.path.basename(existing[-1])[:-4]) + 1 if existing else 1
+        self._write_segment(os.path.join(self.segments_dir, f"{next_id:08d}.npy"), hashes)
+
+        if self.use_bloom:
+            self._set_bits(hashes)
+            self._bloom.flush()
+            self.meta["bloom_dirty"] = False
+        self.meta["count"] += len(hashes)
+        self._write_meta()
+
+        if len(existing) + 1 > self.max_segments or self.meta["count"] > self.meta["capacity"]:
+            self.compact()
+
+    @staticmethod
+    def _write_segment(segment_path, hashes):
+        tmp_path = segment_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, hashes)
+        os.replace(tmp_path, segment_path)
+
+    def compact(self):
+        """
+        Merges all segments into one, and doubles the Bloom filter once it is over capacity.
+        """
+        paths = self._segment_paths()
+        merged = np.unique(np.concatenate([np.load(p) for p in paths])) if paths else np.empty(0, dtype=np.uint64)
+        # Replace the first segment before deleting the rest: a crash in between leaves
+        # duplicate fingerprints across segments, which is harmless, rather than lost ones
+        target = paths[0] if paths else os.path.join(self.segments_dir, f"{1:08d}.npy")
+        self._write_segment(target, merged)
+        for segment_path in paths[1:]:
+            os.remove(segment_path)
+
+        self.meta["count"] = len(merged)
+        if self.meta["count"] > self.meta["capacity"]:
+            count = self.meta["count"]
+            self.meta = self._bloom_params(2 * count, self.meta["error_rate"])
+            self.meta["count"] = count
+            if self.use_bloom:
+                self._open_bloom()
+        self._write_meta()
@@ -0,0 +1,109 @@
+import pandas as pd
+import numpy as np
+from anomaly import AnomalyDetector
+
+
+class CashFlowForecaster:
+    METHODS = ('seasonal_naive', 'ses', 'linear')
+
+    def __init__(self, income_df, expense_df, date_col='date', category_col='category', amount_col='amount'):
+        """
+        Builds aligned month x category matrices for income and expense.
+        Months without transactions count as 0 so every series shares one time axis.
+        """
+        self._align(
+            AnomalyDetector.build_matrix(income_df, date_col, category_col, amount_col),
+            AnomalyDetector.build_matrix(expense_df, date_col, category_col, amount_col)
+        )
+
+    @classmethod
+    def from_matrices(cls, income_matrix, expense_matrix):
+        """
+        Builds the forecaster from existing AnomalyDetector.build_matrix results.
+        """
+        forecaster = cls.__new__(cls)
+        forecaster._align(income_matrix, expense_matrix)
+        return forecaster
+
+    def _align(self, income, expense):
+        months = income.index.union(expense.index)
+        if len(months):
+            months = pd.period_range(months.min(), months.max(), freq='M')
+        self.income = income.reindex(months).fillna(0.0)
+        self.expense = expense.reindex(months).fillna(0.0)
+
+    @staticmethod
+    def _seasonal_naive(values, horizon, season=12):
+        """
+        Repeats the value from the same month of the last season (last value if history is shorter).
+        """
+        n_months = values.shape[0]
+        if n_months < season:
+            return np.repeat(values[-1:], horizon, axis=0)
+        steps = np.arange(horizon) % season
+        return values[n_months - season + steps]
+
+    @staticmethod
+    def _ses(values, horizon, alpha=0.3):
+        """
+        Simple exponential smoothing; the recurrence runs over months, vectorized across all series.
+        """
+        level = values[0].copy()
+        for row in values[1:]:
+            level = alpha * row + (1 - alpha) * level
+        return np.repeat(level[None, :], horizon, axis=0)
+
+    @staticmethod
+    def _linear(values, horizon):
+        """
+        Least-squares linear trend fitted to every series at once in closed form.
+        """
+        n_months = values.shape[0]
+        t = np.arange(n_months, dtype=float)
+        t_centered = t - t.mean()
+        denom = (t_centered ** 2).sum()
+        slope = (t_centered @ (values - values.mean(axis=0))) / denom if denom > 0 else np.zeros(values.shape[1])
+        intercept = values.mean(axis=0) - slope * t.mean()
+        future_t = np.arange(n_months, n_months + horizon, dtype=float)
+        return np.clip(intercept + np.outer(future_t, slope), 0, None)
+
+    def _project(self, matrix, horizon, method, **kwargs):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown forecast method: {method}. Choose from {self.METHODS}")
+
+        future = pd.period_range(self.income.index.max() + 1, periods=horizon, freq='M')
+        if matrix.shape[1] == 0:
+            return pd.DataFrame(index=future, dtype=float)
+
+        values = matrix.to_numpy()
+        if method == 'seasonal_naive':
+            projected = self._seasonal_naive(values, horizon, **kwargs)
+        elif method == 'ses':
+            projected = self._ses(values, horizon, **kwargs)
+        else:
+            projected = self._linear(values, horizon)
+        return pd.DataFrame(projected, index=future, columns=matrix.columns)
+
+    def forecast(self, horizon=6, method='ses', **kwargs):
+        """
+        Projects every income and expense category for the next `horizon` months.
+        Returns (income_forecast, expense_forecast) DataFrames shaped (horizon x categories).
+        """
+        if self.income.empty and self.expense.empty:
+            return pd.DataFrame(dtype=float), pd.DataFrame(dtype=float)
+        return (
+            self._project(self.income, horizon, method, **kwargs),
+            self._project(self.expense, horizon, method, **kwargs),
+        )
+
+    def summary(self, horizon=6, method='ses', **kwargs):
+        """
+        Monthly Income / Expense / Savings projection, matching get_monthly_trends' layout.
+        """
+        income, expense = self.forecast(horizon=horizon, method=method, **kwargs)
+        trends = pd.DataFrame({
+            'Income': income.sum(axis=1),
+            'Expense': expense.sum(axis=1)
+        })
+        trends['Savings'] = trends['Income'] - trends['Expense']
+        return trends
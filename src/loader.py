@@ -1,31 +1,175 @@
 import pandas as pd
 import numpy as np
+import io
 import os
+from concurrent.futures import ProcessPoolExecutor
+from fingerprints import FingerprintStore, fingerprint_rows
+
+try:
+    # Rust-based Excel reader, much faster than the default openpyxl engine
+    import python_calamine
+    # pandas only accepts engine='calamine' from 2.2 on
+    FAST_EXCEL_AVAILABLE = tuple(int(part) for part in pd.__version__.split('.')[:2]) >= (2, 2)
+except ImportError:
+    FAST_EXCEL_AVAILABLE = False
+
+EXCEL_EXTENSIONS = ['.xlsx', '.xls']
+
+# Columns the analytics engine actually uses (after clean_column_names)
+ANALYSIS_COLUMNS = ['date', 'transaction_description', 'category', 'amount', 'type']
+
+# Rows parsed per CSV chunk
+CSV_CHUNK_ROWS = 100_000
+
+
+class FileLimitError(ValueError):
+    """
+    Raised when an input exceeds the loader's configured size or row limit.
+    """
+
+
+def _normalize_column_name(name):
+    return str(name).strip().lower().replace(' ', '_')
+
+
+def _load_sheet(filepath, sheet_name, columns):
+    """
+    Loads and cleans the column names of one sheet. Module-level so it can run in a worker process.
+    """
+    loader = DataLoader(columns=columns)
+    return loader.clean_column_names(loader.load_file(filepath, sheet_name=sheet_name))
+
 
 class DataLoader:
-    def __init__(self):
-        pass
+    def __init__(self, columns=None, max_bytes=None, max_rows=None):
+        """
+        columns: optional list of (snake_case) column names to load; other columns are skipped
+        at parse time. None loads every column.
+        max_bytes / max_rows: optional limits; inputs over them raise FileLimitError.
+        """
+        self.columns = columns
+        self.max_bytes = max_bytes
+        self.max_rows = max_rows
+        self.excel_engine = 'calamine' if FAST_EXCEL_AVAILABLE else None
 
-    def load_file(self, filepath):
+    def _usecols(self):
+        if self.columns is None:
+            return None
+        wanted = {_normalize_column_name(col) for col in self.columns}
+        return lambda col: _normalize_column_name(col) in wanted
+
+    @staticmethod
+    def _stream_size(stream):
+        """
+        Size in bytes of a file-like object (rewound to the start), or None if unknown.
+        """
+        if getattr(stream, 'size', None) is not None:
+            size = stream.size
+        elif stream.seekable():
+            size = stream.seek(0, io.SEEK_END)
+        else:
+            return None
+        if stream.seekable():
+            stream.seek(0)
+        return size
+
+    def _check_rows(self, n_rows):
+        if self.max_rows is not None and n_rows > self.max_rows:
+            raise FileLimitError(f"File has more than {self.max_rows:,} rows")
+
+    def _read_csv_chunked(self, source, total_bytes, progress_callback=None):
+        """
+        Parses a CSV in chunks of CSV_CHUNK_ROWS, enforcing max_rows as it goes so oversized
+        files are rejected before they are fully read.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as handle:
+                return self._read_csv_chunked(handle, total_bytes, progress_callback)
+
+        chunks = []
+        n_rows = 0
+        for chunk in pd.read_csv(source, usecols=self._usecols(), chunksize=CSV_CHUNK_ROWS):
+            n_rows += len(chunk)
+            self._check_rows(n_rows)
+            chunks.append(chunk)
+            if progress_callback is not None and total_bytes:
+                progress_callback(min(source.tell() / total_bytes, 1.0), f"Parsed {n_rows:,} rows")
+
+        if not chunks:
+            return pd.DataFrame()
+        return pd.concat(chunks, ignore_index=True)
+
+    def load_file(self, source, sheet_name=0, filename=None, progress_callback=None):
         """
         Loads data from CSV or Excel file.
+        `source` is a path, raw bytes, or a file-like object such as a Streamlit upload; for the
+        last two the extension is taken from `filename` or the object's `name`.
+        CSVs are parsed in chunks and report progress_callback(fraction, message) as they go.
+        Excel files use the calamine engine when python-calamine is installed, else pandas' default.
         """
-        if not os.path.exists(filepath):
-            raise FileNotFoundError(f"File not found: {filepath}")
+        if isinstance(source, (bytes, bytearray)):
+            source = io.BytesIO(source)
+
+        if isinstance(source, (str, os.PathLike)):
+            if not os.path.exists(source):
+                raise FileNotFoundError(f"File not found: {source}")
+            filename = filename or os.fspath(source)
+            size = os.path.getsize(source)
+        else:
+            filename = filename or getattr(source, 'name', '')
+            size = self._stream_size(source)
+
+        if self.max_bytes is not None and size is not None and size > self.max_bytes:
+            raise FileLimitError(f"File is larger than the {self.max_bytes / 2**20:,.1f} MB limit")
 
-        _, ext = os.path.splitext(filepath)
+        _, ext = os.path.splitext(filename)
         ext = ext.lower()
 
         try:
             if ext == '.csv':
-                df = pd.read_csv(filepath)
-            elif ext in ['.xlsx', '.xls']:
-                df = pd.read_excel(filepath)
+                df = self._read_csv_chunked(source, size, progress_callback)
+            elif ext in EXCEL_EXTENSIONS:
+                # Workbooks can't be parsed in chunks; reading one row past the limit detects overflow
+                nrows = self.max_rows + 1 if self.max_rows is not None else None
+                df = pd.read_excel(source, sheet_name=sheet_name, engine=self.excel_engine,
+                                   usecols=self._usecols(), nrows=nrows)
+                self._check_rows(len(df))
+                if progress_callback is not None:
+                    progress_callback(1.0, f"Parsed {len(df):,} rows")
             else:
                 raise ValueError(f"Unsupported file extension: {ext}")
             return df
+        except FileLimitError:
+            raise
         except Exception as e:
-            raise RuntimeError(f"Error loading file {filepath}: {e}")
+            raise RuntimeError(f"Error loading file {filename}: {e}")
+
+    def load_files(self, filepaths, sheet_name=0, max_workers=None):
+        """
+        Loads several files (and, for Excel, several sheets) in parallel worker processes.
+        sheet_name=None loads every sheet of each workbook. Returns one DataFrame per sheet/file,
+        with cleaned column names so they can be concatenated.
+        """
+        tasks = []
+        for filepath in filepaths:
+            is_excel = os.path.splitext(filepath)[1].lower() in EXCEL_EXTENSIONS
+            if is_excel and sheet_name is None:
+                with pd.ExcelFile(filepath, engine=self.excel_engine) as workbook:
+                    sheets = workbook.sheet_names
+            elif is_excel and isinstance(sheet_name, list):
+                sheets = sheet_name
+            else:
+                sheets = [sheet_name if is_excel else 0]
+            tasks.extend((filepath, sheet) for sheet in sheets)
+
+        if max_workers is None:
+            max_workers = min(len(tasks), os.cpu_count() or 1)
+        if max_workers <= 1:
+            return [_load_sheet(path, sheet, self.columns) for path, sheet in tasks]
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_load_sheet, path, sheet, self.columns) for path, sheet in tasks]
+            return [future.result() for future in futures]
 
     def clean_column_names(self, df):
         """
@@ -71,16 +215,48 @@ class DataLoader:
     def df_shape(self,df):
         return df.shape
 
-    def run_pipeline(self, filepath, date_col='date', amount_col='amount'):
+    def run_pipeline(self, source, date_col='date', amount_col='amount', filename=None, progress_callback=None):
         """
         Runs the full loading and cleaning pipeline.
+        `source` may be a path, bytes or a file-like object (see load_file).
+        progress_callback(fraction, message) is called while loading (0-90%) and cleaning.
         """
-        print(f"Loading {filepath}...")
-        df = self.load_file(filepath)
+        def report(fraction, message):
+            if progress_callback is not None:
+                progress_callback(fraction, message)
+
+        name = filename or getattr(source, 'name', None)
+        if name is None:
+            name = os.fspath(source) if isinstance(source, (str, os.PathLike)) else 'upload'
+        print(f"Loading {name}...")
+        report(0.0, f"Loading {os.path.basename(str(name))}...")
+        df = self.load_file(
+            source, filename=filename,
+            progress_callback=lambda fraction, message: report(0.9 * fraction, message)
+        )
         
         print("Cleaning column names...")
+        report(0.9, "Cleaning data...")
         df = self.clean_column_names(df)
-        
+
+        df = self._clean(df, date_col=date_col, amount_col=amount_col)
+        report(1.0, f"Loaded {len(df):,} transactions")
+        return df
+
+    def run_pipeline_many(self, filepaths, sheet_name=0, max_workers=None, date_col='date', amount_col='amount'):
+        """
+        Runs the pipeline over several statements/sheets loaded in parallel, as one DataFrame.
+        """
+        print(f"Loading {len(filepaths)} files...")
+        frames = self.load_files(filepaths, sheet_name=sheet_name, max_workers=max_workers)
+        df = pd.concat(frames, ignore_index=True)
+
+        return self._clean(df, date_col=date_col, amount_col=amount_col)
+
+    def _clean(self, df, date_col='date', amount_col='amount'):
+        """
+        Shared cleaning steps after column names have been standardized.
+        """
         print("Removing duplicates...")
         df = self.remove_duplicates(df)
         
@@ -88,8 +264,8 @@ class DataLoader:
         # Usually user passes 'Date' but after cleaning it becomes 'date'. 
         # We handle this by checking if the snake_case version exists if original doesn't.
         
-        target_date_col = date_col.strip().lower().replace(' ', '_')
-        target_amount_col = amount_col.strip().lower().replace(' ', '_')
+        target_date_col = _normalize_column_name(date_col)
+        target_amount_col = _normalize_column_name(amount_col)
 
         print(f"Parsing dates (column: {target_date_col})...")
         df = self.parse_dates(df, date_col=target_date_col)
@@ -99,6 +275,42 @@ class DataLoader:
         
         return df
 
+    def import_incremental(self, filepath, ledger_path, store_path, date_col='date', amount_col='amount'):
+        """
+        Imports a statement into a persistent CSV ledger, appending only transactions not seen
+        in earlier imports. Rows are matched on a fingerprint of their normalized
+        (date, description, amount, type), so overlapping statements are not double-counted.
+        Returns the newly appended rows.
+        """
+        df = self.run_pipeline(filepath, date_col=date_col, amount_col=amount_col)
+
+        print("Fingerprinting transactions...")
+        hashes = fingerprint_rows(df, date_col=_normalize_column_name(date_col),
+                                  amount_col=_normalize_column_name(amount_col))
+        store = FingerprintStore(store_path)
+
+        # Drop rows repeated inside this statement, then rows already in the ledger
+        is_new = ~pd.Series(hashes).duplicated().to_numpy()
+        is_new &= ~store.contains(hashes)
+        new_rows = df[is_new]
+        print(f"{len(new_rows)} new transactions, {len(df) - len(new_rows)} already imported.")
+        if new_rows.empty:
+            return new_rows
+
+        # The min-max scaled amount is relative to this import only, so it is not stored
+        new_rows = new_rows.drop(columns=[f"{_normalize_column_name(amount_col)}_normalized"], errors='ignore')
+
+        # Append to the ledger before recording fingerprints: a crash in between can at worst
+        # re-import this batch, never lose it
+        if os.path.exists(ledger_path) and os.path.getsize(ledger_path) > 0:
+            ledger_columns = pd.read_csv(ledger_path, nrows=0).columns
+            new_rows.reindex(columns=ledger_columns).to_csv(ledger_path, mode='a', header=False, index=False)
+        else:
+            new_rows.to_csv(ledger_path, index=False)
+        store.add(hashes[is_new])
+
+        return new_rows
+
 if __name__ == "__main__":
     # Example usage
     loader = DataLoader()
@@ -0,0 +1,246 @@
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+# Add src to path if running directly
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from loader import DataLoader, FileLimitError, ANALYSIS_COLUMNS
+from analytics import FinancialAnalyzer
+
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+MAX_UPLOAD_ROWS = 2_000_000
+MAX_CACHED_DATASETS = 128
+
+
+def to_serializable(obj):
+    """
+    Converts report values (numpy scalars, timestamps, NaN) into plain JSON types.
+    """
+    if isinstance(obj, dict):
+        return {str(key): to_serializable(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_serializable(value) for value in obj]
+    if isinstance(obj, np.generic):
+        obj = obj.item()
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    if isinstance(obj, (pd.Timestamp, pd.Period)):
+        return str(obj)
+    return obj
+
+
+def _start_worker():
+    return None
+
+
+def analyze_upload(data, filename):
+    """
+    Runs the loading pipeline and full analysis on an uploaded statement.
+    Module-level so it runs in a worker process; returns only the (small) results, not the data.
+    """
+    loader = DataLoader(columns=ANALYSIS_COLUMNS, max_rows=MAX_UPLOAD_ROWS)
+    df = loader.run_pipeline(data, filename=filename)
+
+    analyzer = FinancialAnalyzer(df)
+    report = analyzer.generate_full_report()
+    return {
+        "rows": len(df),
+        "report": report,
+        "recurrent": report["Recurrent Charges"],
+    }
+
+
+class ServiceState:
+    def __init__(self, workers=None, preload=False):
+        workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        # Workers are only forked on the first submit; start them now, before any model is
+        # loaded, so they don't inherit the embedding model and its threads
+        for future in [self.pool.submit(_start_worker) for _ in range(workers)]:
+            future.result()
+        self.datasets = OrderedDict()
+        self.datasets_lock = threading.Lock()
+        self.warm_lock = threading.Lock()
+        self._rag = None
+        self._advisor = None
+        if preload:
+            self.get_rag()
+
+    def get_rag(self):
+        """
+        Embedding model and vector index, loaded once and shared by every request.
+        """
+        with self.warm_lock:
+            if self._rag is None:
+                from rag import BudgetRAG
+                self._rag = BudgetRAG()
+            return self._rag
+
+    def get_advisor(self):
+        rag = self.get_rag()
+        with self.warm_lock:
+            if self._advisor is None:
+                from advisor import FinancialAdvisor
+                self._advisor = FinancialAdvisor(rag=rag)
+            return self._advisor
+
+    def store_dataset(self, result):
+        dataset_id = uuid.uuid4().hex
+        with self.datasets_lock:
+            self.datasets[dataset_id] = result
+            # Evict least recently used datasets
+            while len(self.datasets) > MAX_CACHED_DATASETS:
+                self.datasets.popitem(last=False)
+        return dataset_id
+
+    def get_dataset(self, dataset_id):
+        with self.datasets_lock:
+            result = self.datasets.get(dataset_id)
+            if result is not None:
+                self.datasets.move_to_end(dataset_id)
+            return result
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+class FinanceRequestHandler(BaseHTTPRequestHandler):
+    """
+    Endpoints:
+      GET  /health
+      POST /analyze?filename=statement.csv   (body: raw CSV/Excel bytes)
+      GET  /report/<dataset_id>
+      GET  /recurrent/<dataset_id>
+      POST /retrieve                          (body: {"query": ..., "k": 5})
+      POST /advice                            (body: {"dataset_id": ...})
+    """
+    state = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # Keep the console quiet under load; errors are still reported in responses
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(to_serializable(payload)).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            if length < 0:
+                raise ValueError(f"Invalid Content-Length: {length}")
+            if length > MAX_UPLOAD_BYTES:
+                raise FileLimitError(f"Upload exceeds {MAX_UPLOAD_BYTES // (1024 * 1024)} MB limit")
+        except ValueError:
+            # The body was not read, so this connection cannot be reused
+            self.close_connection = True
+            raise
+        return self.rfile.read(length)
+
+    def _read_json(self):
+        body = self._read_body()
+        return json.loads(body) if body else {}
+
+    def _dataset_or_404(self, dataset_id):
+        result = self.state.get_dataset(dataset_id)
+        if result is None:
+            self._send_json(404, {"error": f"Unknown dataset: {dataset_id}"})
+        return result
+
+    def do_GET(self):
+        parts = [part for part in urlparse(self.path).path.split("/") if part]
+        try:
+            if parts == ["health"]:
+                self._send_json(200, {"status": "ok"})
+            elif len(parts) == 2 and parts[0] == "report":
+                result = self._dataset_or_404(parts[1])
+                if result is not None:
+                    self._send_json(200, result["report"])
+            elif len(parts) == 2 and parts[0] == "recurrent":
+                result = self._dataset_or_404(parts[1])
+                if result is not None:
+                    self._send_json(200, result["recurrent"])
+            else:
+                self._send_json(404, {"error": "Not found"})
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        try:
+            if url.path == "/analyze":
+                filename = parse_qs(url.query).get("filename", ["upload.csv"])[0]
+                try:
+                    data = self._read_body()
+                except FileLimitError as e:
+                    self._send_json(413, {"error": str(e)})
+                    return
+                # CPU-bound work goes to the pool; this thread just waits, so other requests keep flowing
+                try:
+                    result = self.state.pool.submit(analyze_upload, data, filename).result()
+                except FileLimitError as e:
+                    self._send_json(413, {"error": str(e)})
+                    return
+                except RuntimeError as e:
+                    self._send_json(422, {"error": str(e)})
+                    return
+                dataset_id = self.state.store_dataset(result)
+                self._send_json(200, {"dataset_id": dataset_id, "rows": result["rows"], "report": result["report"]})
+            elif url.path == "/retrieve":
+                payload = self._read_json()
+                documents = self.state.get_rag().retrieve(payload["query"], k=int(payload.get("k", 5)))
+                self._send_json(200, {"documents": documents})
+            elif url.path == "/advice":
+                payload = self._read_json()
+                result = self._dataset_or_404(payload.get("dataset_id"))
+                if result is not None:
+                    advice = self.state.get_advisor().get_advice(report=result["report"])
+                    self._send_json(200, {"advice": advice})
+            else:
+                self._send_json(404, {"error": "Not found"})
+        except (KeyError, ValueError) as e:
+            self._send_json(400, {"error": f"Bad request: {e}"})
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FinSight AI headless HTTP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=None, help="analysis worker processes (default: CPU count)")
+    parser.add_argument("--preload", action="store_true", help="load the embedding model and index at startup")
+    args = parser.parse_args()
+
+    state = ServiceState(workers=args.workers, preload=args.preload)
+    FinanceRequestHandler.state = state
+    server = ThreadingHTTPServer((args.host, args.port), FinanceRequestHandler)
+    print(f"Serving FinSight AI on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        state.shutdown()
+
+
+if __name__ == "__main__":
+    main()
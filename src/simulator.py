@@ -0,0 +1,114 @@
+import pandas as pd
+import numpy as np
+
+PERCENTILES = [5, 25, 50, 75, 95]
+
+
+class SavingsSimulator:
+    def __init__(self, expense_matrix, monthly_income, recurring_matrix=None):
+        """
+        expense_matrix: (month x category) DataFrame of monthly spending (0 where none).
+        monthly_income: per-month income aligned with expense_matrix's rows.
+        recurring_matrix: (month x category) DataFrame of the part of that spending that came from
+        detected recurring charges; missing months/categories count as 0.
+        """
+        self.categories = pd.Index(expense_matrix.columns)
+        self.expenses = expense_matrix.to_numpy(dtype=float)
+        self.income = np.asarray(monthly_income, dtype=float)
+        if recurring_matrix is None:
+            self.recurring = np.zeros_like(self.expenses)
+        else:
+            recurring = recurring_matrix.reindex(index=expense_matrix.index, columns=self.categories)
+            # Never credit more than the month's category spending, so spend can't go negative
+            self.recurring = np.clip(recurring.fillna(0.0).to_numpy(dtype=float), 0.0, np.maximum(self.expenses, 0.0))
+
+    def cut_vector(self, cuts_by_category):
+        """
+        Builds a per-category cut array (fractions, e.g. 0.2 = 20% less) from a {category: cut} dict.
+        """
+        return pd.Series(cuts_by_category, dtype=float).reindex(self.categories).fillna(0.0).to_numpy()
+
+    def _sample_totals(self, horizon, n_draws, rng):
+        """
+        Monte Carlo resampling of whole historical months (keeping cross-category correlation).
+        Returns per-draw horizon totals: expenses and recurring charges (draws x categories),
+        and income (draws,).
+        """
+        n_months = self.expenses.shape[0]
+        picks = rng.integers(0, n_months, size=(n_draws, horizon))
+        # times[d, m] = how often month m was drawn in path d, so totals are one matrix product
+        offsets = picks + np.arange(n_draws)[:, None] * n_months
+        times = np.bincount(offsets.ravel(), minlength=n_draws * n_months).reshape(n_draws, n_months)
+        return times @ self.expenses, times @ self.recurring, times @ self.income
+
+    def simulate(self, cuts=0.0, cancel_recurring=False, income_shock=1.0, horizon=12, n_draws=2000,
+                 starting_balance=0.0, seed=None, chunk_size=1024):
+        """
+        Evaluates many budget scenarios at once against the same Monte Carlo paths.
+
+        cuts: per-category spending cuts as fractions, shape (categories,) or (scenarios, categories).
+        cancel_recurring: whether detected recurring charges are cancelled, scalar or (scenarios,).
+        income_shock: income multiplier (e.g. 0.9 = 10% drop), scalar or (scenarios,).
+
+        Scenario savings are linear in the category totals, so the scenarios x categories x months
+        tensor reduces to (draws x categories) @ (categories x scenarios) per chunk of scenarios.
+        Returns one row per scenario: savings percentiles over the horizon, the mean, and the
+        probability that the ending balance is positive.
+        """
+        cuts = np.atleast_2d(np.asarray(cuts, dtype=float))
+        if cuts.shape[1] == 1 and len(self.categories) != 1:
+            cuts = np.repeat(cuts, len(self.categories), axis=1)
+        cancel = np.atleast_1d(np.asarray(cancel_recurring, dtype=float))
+        shock = np.atleast_1d(np.asarray(income_shock, dtype=float))
+
+        n_scenarios = max(len(cuts), len(cancel), len(shock))
+        cuts = np.broadcast_to(cuts, (n_scenarios, len(self.categories)))
+        cancel = np.broadcast_to(cancel, (n_scenarios,))
+        shock = np.broadcast_to(shock, (n_scenarios,))
+
+        columns = [f"p{p}" for p in PERCENTILES] + ['mean', 'prob_positive']
+        if not len(self.income):
+            return pd.DataFrame(np.nan, index=range(n_scenarios), columns=columns)
+
+        rng = np.random.default_rng(seed)
+        expense_totals, recurring_totals, income_totals = self._sample_totals(horizon, n_draws, rng)
+
+        keep = 1.0 - np.clip(cuts, 0.0, 1.0)
+
+        results = np.empty((n_scenarios, len(columns)))
+        for start in range(0, n_scenarios, chunk_size):
+            stop = min(start + chunk_size, n_scenarios)
+            # Cancelled recurring charges no longer occur in the months that had them,
+            # so the cut does not apply to them either
+            balance = (starting_balance
+                       + income_totals[:, None] * shock[None, start:stop]
+                       - expense_totals @ keep[start:stop].T
+                       + (recurring_totals @ keep[start:stop].T) * cancel[None, start:stop])
+            results[start:stop, :len(PERCENTILES)] = np.percentile(balance, PERCENTILES, axis=0).T
+            results[start:stop, -2] = balance.mean(axis=0)
+            results[start:stop, -1] = (balance > 0).mean(axis=0)
+
+        return pd.DataFrame(results, columns=columns)
+
+    def preset_scenarios(self, overspending_categories=(), horizon=12, n_draws=2000, seed=0):
+        """
+        A small set of named what-if scenarios used by the report, dashboard and advisor prompt.
+        """
+        overspending_cut = self.cut_vector({cat: 0.2 for cat in overspending_categories})
+        scenarios = {
+            "Baseline (no changes)": (0.0, False, 1.0),
+            "Cut overspending categories by 20%": (overspending_cut, False, 1.0),
+            "Cut all spending by 10%": (0.1, False, 1.0),
+            "Cancel recurring charges": (0.0, True, 1.0),
+            "Income drops 10%": (0.0, False, 0.9),
+        }
+        names = list(scenarios)
+        cuts = np.array([np.broadcast_to(c, (len(self.categories),)) for c, _, _ in scenarios.values()])
+        results = self.simulate(
+            cuts=cuts,
+            cancel_recurring=[cancel for _, cancel, _ in scenarios.values()],
+            income_shock=[shock for _, _, shock in scenarios.values()],
+            horizon=horizon, n_draws=n_draws, seed=seed
+        )
+        results.index = names
+        return results